@@ -20,7 +20,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import project modules
 from src.data_processing import load_npri_data, clean_npri_data, filter_by_year, filter_by_province
-from src.analysis import summarize_pollutants, trend_analysis, compare_categories
+from src.analysis import (summarize_pollutants, trend_analysis, compare_categories,
+                          build_naics_rollups, rollup_naics)
 from src.visualization import plot_pollutant_trends, plot_provincial_comparison, plot_facility_comparisons
 
 
@@ -107,6 +108,15 @@ def main():
             fig.savefig(fig_path)
             print(f"Provincial comparison visualization saved to {fig_path}")
         
+        # Industry sector comparison served from the NAICS rollups
+        if 'NAICS' in filtered_data.columns:
+            print("\nComparing industry sectors...")
+            naics_rollups = build_naics_rollups(filtered_data, args.pollutant_col)
+            sector_stats = rollup_naics(naics_rollups, 'sector')
+            sector_path = os.path.join(args.output_dir, 'sector_comparison.csv')
+            sector_stats.to_csv(sector_path)
+            print(f"Sector comparison saved to {sector_path}")
+        
         # Facility comparison
         if 'Facility_Name' in filtered_data.columns:
             print("\nComparing top facilities...")
@@ -8,8 +8,11 @@ generation from the National Pollutant Release Inventory (NPRI) data.
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
 from scipy import stats
 
+from .data_processing import NAICS_LEVELS, NAICS_LEVEL_COLUMNS, naics_to_codes
+
 
 def summarize_pollutants(df: pd.DataFrame, pollutant_col: str, 
                         groupby_col: Optional[str] = None) -> pd.DataFrame:
@@ -201,3 +204,402 @@ def compare_categories(df: pd.DataFrame, value_col: str,
     category_stats['cumulative_percent'] = category_stats['percent_of_total'].cumsum()
     
     return category_stats
+
+
+def _combine_rollup(table: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """
+    Merge rollup rows sharing the same keys
+    
+    Sums of squared deviations (m2) are combined with the parallel
+    (Chan et al.) formula, adding each part's squared distance to the
+    merged mean, so the variance stays accurate for large values.
+    """
+    grouped = table.groupby(keys)
+    merged_mean = grouped['sum'].transform('sum') / grouped['count'].transform('sum')
+    table = table.assign(m2=table['m2'] + table['count'] * (table['mean'] - merged_mean) ** 2)
+    
+    combined = table.groupby(keys).agg(
+        count=('count', 'sum'),
+        sum=('sum', 'sum'),
+        m2=('m2', 'sum'),
+        min=('min', 'min'),
+        max=('max', 'max')
+    ).reset_index()
+    combined['mean'] = combined['sum'] / combined['count']
+    
+    return combined[keys + ['count', 'sum', 'mean', 'm2', 'min', 'max']]
+
+
+def build_naics_rollups(df: pd.DataFrame, value_col: str, 
+                        naics_col: str = 'NAICS', 
+                        year_col: Optional[str] = 'Reporting_Year') -> Dict[str, pd.DataFrame]:
+    """
+    Precompute aggregates of a value at every level of the NAICS hierarchy
+    
+    The raw rows are scanned once to aggregate by 6-digit code (and year);
+    every coarser level is then rolled up from that small table, so sector,
+    subsector and industry group queries never touch the full dataset.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NPRI data; the 'NAICS_Code' column added by clean_npri_data is used
+        if present, otherwise codes are parsed from naics_col
+    value_col : str
+        Column name containing the values to aggregate
+    naics_col : str, default='NAICS'
+        Column containing 6-digit NAICS codes
+    year_col : str, optional, default='Reporting_Year'
+        Column containing year information; aggregates are kept per year if present
+        
+    Returns
+    -------
+    Dict[str, pd.DataFrame]
+        One table per level in NAICS_LEVELS with columns 'NAICS_Code',
+        the year column, 'count', 'sum', 'mean', 'm2' (sum of squared
+        deviations from the mean), 'min' and 'max'
+    """
+    code_col = NAICS_LEVEL_COLUMNS['national_industry']
+    if code_col in df.columns:
+        codes = df[code_col]
+    else:
+        codes = naics_to_codes(df[naics_col])
+    
+    base = pd.DataFrame({
+        'NAICS_Code': codes.array,
+        'value': pd.to_numeric(df[value_col], errors='coerce').array
+    })
+    
+    keys = ['NAICS_Code']
+    if year_col and year_col in df.columns:
+        base[year_col] = df[year_col].array
+        keys.append(year_col)
+    
+    base = base.dropna(subset=['NAICS_Code', 'value'])
+    
+    # Single pass over the rows at the finest level
+    finest = base.groupby(keys).agg(
+        count=('value', 'count'),
+        sum=('value', 'sum'),
+        mean=('value', 'mean'),
+        var=('value', 'var'),
+        min=('value', 'min'),
+        max=('value', 'max')
+    ).reset_index()
+    finest['m2'] = (finest['var'] * (finest['count'] - 1)).fillna(0)
+    finest = finest[keys + ['count', 'sum', 'mean', 'm2', 'min', 'max']]
+    
+    rollups = {}
+    for level, digits in NAICS_LEVELS.items():
+        if digits == 6:
+            rollups[level] = finest
+            continue
+        
+        level_table = finest.assign(NAICS_Code=finest['NAICS_Code'] // 10 ** (6 - digits))
+        rollups[level] = _combine_rollup(level_table, keys)
+    
+    return rollups
+
+
+def _summarize_rollup(table: pd.DataFrame, year_col: Optional[str] = 'Reporting_Year', 
+                      year_filter: Optional[int] = None) -> pd.DataFrame:
+    """
+    Collapse a rollup table over years and derive the standard deviation
+    """
+    if year_filter and year_col in table.columns:
+        table = table[table[year_col] == year_filter]
+    
+    summary = _combine_rollup(table, ['NAICS_Code'])
+    
+    # Sample standard deviation from the sum of squared deviations
+    count = summary['count'].astype(float)
+    summary['std'] = np.sqrt(summary['m2'] / (count - 1)).where(count > 1)
+    
+    return summary[['NAICS_Code', 'count', 'sum', 'mean', 'std', 'min', 'max']]
+
+
+def _add_share_columns(summary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sort a category summary by sum and add percent and cumulative percent of total
+    """
+    summary = summary.sort_values(by='sum', ascending=False).reset_index(drop=True)
+    
+    total_sum = summary['sum'].sum()
+    summary['percent_of_total'] = (summary['sum'] / total_sum) * 100
+    summary['cumulative_percent'] = summary['percent_of_total'].cumsum()
+    
+    return summary
+
+
+def rollup_naics(rollups: Dict[str, pd.DataFrame], level: str = 'sector', 
+                 year_col: Optional[str] = 'Reporting_Year', 
+                 year_filter: Optional[int] = None) -> pd.DataFrame:
+    """
+    Compare NAICS categories at a given level using precomputed rollups
+    
+    Parameters
+    ----------
+    rollups : Dict[str, pd.DataFrame]
+        Output of build_naics_rollups
+    level : str, default='sector'
+        NAICS level to report ('sector', 'subsector', 'industry_group',
+        'industry' or 'national_industry')
+    year_col : str, optional, default='Reporting_Year'
+        Column containing year information
+    year_filter : int, optional
+        Specific year to filter data for
+        
+    Returns
+    -------
+    pd.DataFrame
+        Comparison results in the layout of compare_categories (without median,
+        which cannot be recovered from the aggregates)
+    """
+    if level not in NAICS_LEVELS:
+        raise ValueError(f"Level must be one of {list(NAICS_LEVELS)}")
+    
+    summary = _summarize_rollup(rollups[level], year_col, year_filter)
+    return _add_share_columns(summary)
+
+
+def drill_down_naics(rollups: Dict[str, pd.DataFrame], code: int, 
+                     year_col: Optional[str] = 'Reporting_Year', 
+                     year_filter: Optional[int] = None) -> pd.DataFrame:
+    """
+    Break a NAICS code down into its categories at the next finer level
+    
+    Parameters
+    ----------
+    rollups : Dict[str, pd.DataFrame]
+        Output of build_naics_rollups
+    code : int
+        NAICS code to drill into (e.g., 21 for Mining, 211 for Oil and gas extraction)
+    year_col : str, optional, default='Reporting_Year'
+        Column containing year information
+    year_filter : int, optional
+        Specific year to filter data for
+        
+    Returns
+    -------
+    pd.DataFrame
+        Comparison results for the child categories, with shares relative to the parent
+    """
+    digits = len(str(int(code)))
+    levels = list(NAICS_LEVELS)
+    level_digits = list(NAICS_LEVELS.values())
+    
+    if digits not in level_digits:
+        raise ValueError(f"Code must have between 2 and 6 digits, got {code}")
+    if digits == 6:
+        raise ValueError("Cannot drill down below a 6-digit national industry code")
+    
+    child_level = levels[level_digits.index(digits) + 1]
+    child_digits = NAICS_LEVELS[child_level]
+    
+    summary = _summarize_rollup(rollups[child_level], year_col, year_filter)
+    summary = summary[summary['NAICS_Code'] // 10 ** (child_digits - digits) == int(code)]
+    
+    return _add_share_columns(summary)
+
+
+def naics_trend(rollups: Dict[str, pd.DataFrame], level: str = 'sector', 
+                year_col: str = 'Reporting_Year') -> pd.DataFrame:
+    """
+    Analyze trends over time for each NAICS category at a given level
+    using precomputed rollups
+    
+    Parameters
+    ----------
+    rollups : Dict[str, pd.DataFrame]
+        Output of build_naics_rollups (built with a year column)
+    level : str, default='sector'
+        NAICS level to report
+    year_col : str, default='Reporting_Year'
+        Column containing year information
+        
+    Returns
+    -------
+    pd.DataFrame
+        Yearly mean per NAICS code with year-over-year changes
+    """
+    if level not in NAICS_LEVELS:
+        raise ValueError(f"Level must be one of {list(NAICS_LEVELS)}")
+    
+    table = rollups[level]
+    if year_col not in table.columns:
+        raise ValueError(f"Rollups do not contain '{year_col}' column")
+    
+    trend_df = table[[year_col, 'NAICS_Code']].copy()
+    trend_df['mean'] = table['sum'] / table['count']
+    trend_df = trend_df.sort_values(by=['NAICS_Code', year_col]).reset_index(drop=True)
+    
+    # Year-over-year changes within each code
+    by_code = trend_df.groupby('NAICS_Code')['mean']
+    trend_df['Absolute_Change'] = by_code.diff()
+    trend_df['Percent_Change'] = by_code.pct_change() * 100
+    
+    return trend_df
+
+
+def _trend_tests_block(values: np.ndarray, years: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    OLS slope, Sen's slope and Mann-Kendall test for every row of a
+    (series x years) matrix, with NaN marking years without a report
+    """
+    observed = ~np.isnan(values)
+    n = observed.sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # OLS slope over the observed years of each series
+        x = np.where(observed, years[None, :], np.nan)
+        x_centered = x - np.nanmean(x, axis=1, keepdims=True)
+        y_centered = values - np.nanmean(values, axis=1, keepdims=True)
+        sxx = np.nansum(x_centered ** 2, axis=1)
+        ols_slope = np.nansum(x_centered * y_centered, axis=1) / sxx
+        
+        residuals = y_centered - ols_slope[:, None] * x_centered
+        dof = n - 2
+        std_err = np.sqrt(np.nansum(residuals ** 2, axis=1) / dof / sxx)
+        t_stat = ols_slope / std_err
+        ols_p = np.where(dof > 0, 2 * stats.t.sf(np.abs(t_stat), np.maximum(dof, 1)), np.nan)
+        
+        # Differences over every pair of years i < j; missing years give NaN
+        i, j = np.triu_indices(len(years), k=1)
+        diffs = values[:, j] - values[:, i]
+        
+        # Sen's slope is the median pairwise slope; np.sort puts NaN last,
+        # so the median sits in the first n_pairs entries of each row
+        n_pairs = n * (n - 1) // 2
+        sen_slope = np.full(len(values), np.nan)
+        if len(i):
+            pair_slopes = np.sort(diffs / (years[j] - years[i])[None, :], axis=1)
+            lower_idx = np.maximum((n_pairs - 1) // 2, 0)[:, None]
+            upper_idx = np.minimum(n_pairs // 2, len(i) - 1)[:, None]
+            lower = np.take_along_axis(pair_slopes, lower_idx, axis=1)
+            upper = np.take_along_axis(pair_slopes, upper_idx, axis=1)
+            sen_slope = np.where(n_pairs > 0, (lower + upper)[:, 0] / 2, np.nan)
+
+        mk_s = np.nansum(np.sign(diffs), axis=1)
+        
+        # Tie correction: each value tied with c others adds c(2c + 7) to
+        # the sum of t(t - 1)(2t + 5) over tie groups of size t
+        pair_years = np.zeros((len(i), len(years)))
+        pair_years[np.arange(len(i)), i] = 1
+        pair_years[np.arange(len(j)), j] = 1
+        tied_with = (diffs == 0).astype(float) @ pair_years
+        tie_term = np.sum(tied_with * (2 * tied_with + 7), axis=1)
+        
+        mk_var = (n * (n - 1) * (2 * n + 5) - tie_term) / 18
+        mk_z = np.where(mk_s > 0, mk_s - 1, np.where(mk_s < 0, mk_s + 1, 0)) / np.sqrt(mk_var)
+        mk_z = np.where(mk_var > 0, mk_z, np.nan)
+        mk_p = 2 * stats.norm.sf(np.abs(mk_z))
+    
+    return {
+        'N_Years': n,
+        'OLS_Slope': ols_slope,
+        'OLS_P_Value': ols_p,
+        'Sen_Slope': sen_slope,
+        'MK_S': mk_s,
+        'MK_Z': mk_z,
+        'MK_P_Value': mk_p
+    }
+
+
+def _fdr_correction(p_values: np.ndarray) -> np.ndarray:
+    """
+    Benjamini-Hochberg adjusted p-values (q-values), ignoring NaN
+    """
+    q_values = np.full(len(p_values), np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    if not len(valid):
+        return q_values
+    
+    order = valid[np.argsort(p_values[valid])]
+    ranked = p_values[order] * len(order) / np.arange(1, len(order) + 1)
+    
+    # Enforce monotonicity from the largest p-value down
+    q_values[order] = np.minimum.accumulate(ranked[::-1])[::-1].clip(max=1)
+    return q_values
+
+
+def trend_significance(df: pd.DataFrame, value_col: str, 
+                       series_cols: List[str], 
+                       year_col: str = 'Reporting_Year', 
+                       agg: str = 'sum', 
+                       min_years: int = 3, 
+                       alpha: float = 0.05, 
+                       fdr: bool = True, 
+                       n_jobs: int = 1, 
+                       chunk_size: int = 5000) -> pd.DataFrame:
+    """
+    Test every series (e.g., facility x substance) for a monotonic trend over time
+    
+    All series are pivoted into a year x series matrix padded with NaN for
+    missing years, and the OLS slope t-test, Sen's slope and Mann-Kendall test
+    are computed with vectorized NumPy over blocks of rows.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NPRI data
+    value_col : str
+        Column name containing the values to test
+    series_cols : List[str]
+        Columns identifying a series (e.g., ['NPRI_ID', 'Substance_Name'])
+    year_col : str, default='Reporting_Year'
+        Column containing year information
+    agg : str, default='sum'
+        How to combine multiple rows of a series in the same year
+    min_years : int, default=3
+        Series reported in fewer years are left out
+    alpha : float, default=0.05
+        Significance level used for the 'Trend' column
+    fdr : bool, default=True
+        Whether to add Benjamini-Hochberg q-values and use them for 'Trend'
+    n_jobs : int, default=1
+        Number of worker processes; blocks of rows are shared out between them
+    chunk_size : int, default=5000
+        Number of series per block, which bounds memory use per worker
+        
+    Returns
+    -------
+    pd.DataFrame
+        One row per series with N_Years, OLS_Slope, OLS_P_Value, Sen_Slope,
+        MK_S, MK_Z, MK_P_Value, OLS_Q_Value and MK_Q_Value (if fdr) and
+        Trend ('increasing', 'decreasing' or 'no trend')
+    """
+    # Blank quantities must stay missing years, not aggregate to 0
+    reported = df.dropna(subset=[value_col])
+    yearly = reported.groupby(series_cols + [year_col])[value_col].agg(agg)
+    matrix = yearly.unstack(year_col).sort_index(axis=1)
+    matrix = matrix[matrix.notna().sum(axis=1) >= min_years]
+    
+    values = matrix.to_numpy(dtype=float)
+    years = matrix.columns.to_numpy(dtype=float)
+    blocks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    
+    if n_jobs > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_trend_tests_block, blocks, [years] * len(blocks)))
+    else:
+        results = [_trend_tests_block(block, years) for block in blocks]
+    
+    if results:
+        columns = {key: np.concatenate([result[key] for result in results]) for key in results[0]}
+    else:
+        columns = _trend_tests_block(np.empty((0, len(years))), years)
+    
+    trend_df = pd.DataFrame(columns, index=matrix.index)
+    
+    p_col = 'MK_P_Value'
+    if fdr:
+        trend_df['OLS_Q_Value'] = _fdr_correction(trend_df['OLS_P_Value'].to_numpy())
+        trend_df['MK_Q_Value'] = _fdr_correction(trend_df['MK_P_Value'].to_numpy())
+        p_col = 'MK_Q_Value'
+    
+    significant = trend_df[p_col] < alpha
+    trend_df['Trend'] = np.select(
+        [significant & (trend_df['MK_S'] > 0), significant & (trend_df['MK_S'] < 0)],
+        ['increasing', 'decreasing'], default='no trend')
+    
+    return trend_df.reset_index()
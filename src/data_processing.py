@@ -11,6 +11,25 @@ import os
 from typing import Tuple, List, Dict, Optional, Union
 
 
+# Number of leading NAICS digits that define each level of the hierarchy
+NAICS_LEVELS = {
+    'sector': 2,
+    'subsector': 3,
+    'industry_group': 4,
+    'industry': 5,
+    'national_industry': 6
+}
+
+# Integer columns added by add_naics_hierarchy, one per level
+NAICS_LEVEL_COLUMNS = {
+    'sector': 'NAICS_Sector',
+    'subsector': 'NAICS_Subsector',
+    'industry_group': 'NAICS_Industry_Group',
+    'industry': 'NAICS_Industry',
+    'national_industry': 'NAICS_Code'
+}
+
+
 def load_npri_data(file_path: str) -> pd.DataFrame:
     """
     Load NPRI data from various file formats (CSV, Excel)
@@ -66,12 +85,95 @@ def clean_npri_data(df: pd.DataFrame) -> pd.DataFrame:
     # Remove rows with all NaN values
     df_clean = df_clean.dropna(how='all')
     
+    # Encode the NAICS hierarchy once so rollups don't slice strings per query
+    if 'NAICS' in df_clean.columns:
+        df_clean = add_naics_hierarchy(df_clean)
+    
     # Reset index
     df_clean = df_clean.reset_index(drop=True)
     
     return df_clean
 
 
+def naics_to_codes(naics: pd.Series) -> pd.Series:
+    """
+    Convert a NAICS column to integer 6-digit codes
+    
+    Parameters
+    ----------
+    naics : pd.Series
+        NAICS codes stored as strings or numbers
+        
+    Returns
+    -------
+    pd.Series
+        Nullable integer codes; values that are not valid 6-digit codes become <NA>
+    """
+    codes = pd.to_numeric(naics, errors='coerce')
+    codes = codes.where((codes >= 100000) & (codes <= 999999) & (codes % 1 == 0))
+    return codes.astype('Int32')
+
+
+def add_naics_hierarchy(df: pd.DataFrame, naics_col: str = 'NAICS') -> pd.DataFrame:
+    """
+    Add the integer-encoded 6-digit NAICS code and its prefix columns
+    (sector, subsector, industry group and industry)
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NPRI data
+    naics_col : str, default='NAICS'
+        Column containing 6-digit NAICS codes
+        
+    Returns
+    -------
+    pd.DataFrame
+        NPRI data with one integer column per NAICS level
+    """
+    if naics_col not in df.columns:
+        raise ValueError(f"DataFrame does not contain '{naics_col}' column")
+    
+    df_naics = df.copy()
+    codes = naics_to_codes(df_naics[naics_col])
+    
+    # Integer division drops the trailing digits of each level
+    for level, col in NAICS_LEVEL_COLUMNS.items():
+        df_naics[col] = codes // 10 ** (6 - NAICS_LEVELS[level])
+    
+    return df_naics
+
+
+def filter_by_naics(df: pd.DataFrame, code: int) -> pd.DataFrame:
+    """
+    Filter NPRI data for a NAICS code at any level of the hierarchy
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NPRI data with the columns added by add_naics_hierarchy
+    code : int
+        NAICS code with 2 to 6 digits (e.g., 21 for Mining, 211110 for
+        Conventional oil and gas extraction)
+        
+    Returns
+    -------
+    pd.DataFrame
+        Filtered NPRI data for the specified NAICS code
+    """
+    digits = len(str(int(code)))
+    levels = {n_digits: level for level, n_digits in NAICS_LEVELS.items()}
+    
+    if digits not in levels:
+        raise ValueError(f"Code must have between 2 and 6 digits, got {code}")
+    
+    level_col = NAICS_LEVEL_COLUMNS[levels[digits]]
+    if level_col not in df.columns:
+        raise ValueError(f"DataFrame does not contain '{level_col}' column")
+    
+    return df[(df[level_col] == int(code)).fillna(False)].reset_index(drop=True)
+
+
 def filter_by_year(df: pd.DataFrame, year: int) -> pd.DataFrame:
     """
     Filter NPRI data for a specific reporting year
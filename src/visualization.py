@@ -9,7 +9,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import List, Tuple, Dict, Optional, Union
+from typing import List, Tuple, Dict, Optional, Union, Iterable
 
 
 def set_plotting_style():
@@ -169,12 +169,279 @@ def plot_facility_comparisons(df: pd.DataFrame, value_col: str,
     return fig
 
 
+def log_bin_counts(df: pd.DataFrame, value_col: str, 
+                   bins_per_decade: int = 10, 
+                   groupby_col: Optional[str] = None) -> pd.Series:
+    """
+    Count positive values in log-spaced bins
+    
+    Bin i covers [10**(i / bins_per_decade), 10**((i + 1) / bins_per_decade)),
+    so counts from different chunks or partitions share the same bins and
+    can be combined with merge_bin_counts. The bin scale is recorded in
+    counts.attrs['bins_per_decade'] for merging and plotting.
+    
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NPRI data (or a chunk of it)
+    value_col : str
+        Column name containing the values to bin
+    bins_per_decade : int, default=10
+        Number of bins per power of ten
+    groupby_col : str, optional
+        Column to count separately by (e.g., 'Substance_Name', 'Province')
+        
+    Returns
+    -------
+    pd.Series
+        Counts indexed by bin number, or by (group, bin) if groupby_col is given
+    """
+    values = df[value_col].to_numpy(dtype=float, na_value=np.nan)
+    
+    # Zero, negative, infinite and missing values cannot be placed on a log axis
+    mask = np.isfinite(values) & (values > 0)
+    bins = np.floor(np.log10(values[mask]) * bins_per_decade).astype(np.int64)
+    
+    if groupby_col:
+        groups = df[groupby_col].to_numpy()[mask]
+        counts = pd.DataFrame({groupby_col: groups, 'bin': bins}).groupby(
+            [groupby_col, 'bin']).size()
+    elif bins.size:
+        lowest = bins.min()
+        counts = pd.Series(np.bincount(bins - lowest),
+                           index=pd.RangeIndex(lowest, bins.max() + 1, name='bin'))
+        counts = counts[counts > 0]
+    else:
+        counts = pd.Series([], index=pd.Index([], dtype=np.int64, name='bin'), dtype=np.int64)
+    
+    counts.attrs['bins_per_decade'] = bins_per_decade
+    return counts
+
+
+def merge_bin_counts(counts: Iterable[pd.Series]) -> pd.Series:
+    """
+    Combine log bin counts computed on separate chunks or partitions
+    
+    Parameters
+    ----------
+    counts : Iterable[pd.Series]
+        Outputs of log_bin_counts, all built with the same bins_per_decade
+        
+    Returns
+    -------
+    pd.Series
+        Total counts per bin (or per group and bin)
+    """
+    counts = list(counts)
+    if not counts:
+        raise ValueError("No bin counts to merge")
+    
+    scales = {part.attrs.get('bins_per_decade') for part in counts}
+    if len(scales) > 1:
+        raise ValueError(f"Cannot merge counts with different bins_per_decade: {scales}")
+    
+    combined = pd.concat(counts)
+    combined = combined.groupby(level=list(range(combined.index.nlevels))).sum()
+    combined.attrs['bins_per_decade'] = scales.pop()
+    return combined
+
+
+def stream_log_bin_counts(chunks: Iterable[pd.DataFrame], value_col: str, 
+                          bins_per_decade: int = 10, 
+                          groupby_col: Optional[str] = None) -> pd.Series:
+    """
+    Count values in log-spaced bins chunk by chunk, e.g. from
+    pd.read_csv(..., chunksize=...), without holding the full data in memory
+    
+    Parameters
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        DataFrame chunks of NPRI data
+    value_col : str
+        Column name containing the values to bin
+    bins_per_decade : int, default=10
+        Number of bins per power of ten
+    groupby_col : str, optional
+        Column to count separately by
+        
+    Returns
+    -------
+    pd.Series
+        Total counts per bin (or per group and bin)
+    """
+    total = None
+    for chunk in chunks:
+        counts = log_bin_counts(chunk, value_col, bins_per_decade, groupby_col)
+        total = counts if total is None else merge_bin_counts([total, counts])
+    
+    if total is None:
+        raise ValueError("No chunks to bin")
+    
+    return total
+
+
+def _binned_kde(centers: np.ndarray, counts: np.ndarray, 
+                grid: np.ndarray, bin_width: float) -> np.ndarray:
+    """
+    Gaussian KDE evaluated from bin centers weighted by their counts
+    """
+    weights = counts / counts.sum()
+    mean = np.sum(weights * centers)
+    
+    # Sheppard's correction adds back the spread lost to binning
+    sigma = np.sqrt(np.sum(weights * (centers - mean) ** 2) + bin_width ** 2 / 12)
+    
+    # Scott's rule, but never narrower than a bin so the curve doesn't trace the bars
+    bandwidth = max(sigma * counts.sum() ** (-1 / 5), bin_width)
+    
+    z = (grid[:, None] - centers[None, :]) / bandwidth
+    return np.exp(-0.5 * z ** 2) @ weights / (bandwidth * np.sqrt(2 * np.pi))
+
+
+def _plot_binned_panels(edges: np.ndarray, table: pd.DataFrame, 
+                        log_scale: bool, kde: bool, 
+                        xlabel: str, title: str, ncols: int) -> plt.Figure:
+    """
+    Draw one histogram panel per row of a (groups x bins) count table
+    """
+    set_plotting_style()
+    
+    n_panels = len(table)
+    ncols = min(ncols, n_panels)
+    nrows = int(np.ceil(n_panels / ncols))
+    
+    if n_panels == 1:
+        fig, ax = plt.subplots()
+        axes = np.array([ax])
+    else:
+        fig, axes = plt.subplots(nrows, ncols, sharex=True, squeeze=False,
+                                 figsize=(4 * ncols, 3 * nrows))
+        axes = axes.ravel()
+    
+    # KDE is computed in the space the bins are evenly spaced in
+    positions = np.log10(edges) if log_scale else edges
+    centers = (positions[:-1] + positions[1:]) / 2
+    bin_width = positions[1] - positions[0]
+    grid = np.linspace(positions[0], positions[-1], 200)
+    
+    for ax, (label, row) in zip(axes, table.iterrows()):
+        counts = row.to_numpy(dtype=float)
+        ax.stairs(counts, edges, fill=True, alpha=0.6)
+        
+        if kde and counts.sum() > 0:
+            density = _binned_kde(centers, counts, grid, bin_width)
+            ax.plot(10 ** grid if log_scale else grid, 
+                    density * counts.sum() * bin_width, linewidth=2)
+        
+        if log_scale:
+            ax.set_xscale('log')
+        
+        if n_panels > 1:
+            ax.set_title(str(label))
+    
+    # Hide unused panels in the last row
+    for ax in axes[n_panels:]:
+        ax.set_visible(False)
+    
+    if n_panels == 1:
+        axes[0].set_xlabel(xlabel)
+        axes[0].set_ylabel('Frequency')
+        axes[0].set_title(title)
+    else:
+        fig.supxlabel(xlabel)
+        fig.supylabel('Frequency')
+        fig.suptitle(title)
+    
+    plt.tight_layout()
+    return fig
+
+
+def _top_groups(table: pd.DataFrame, top_n: int) -> pd.DataFrame:
+    """
+    Keep the top_n rows of a (groups x bins) count table by total count
+    """
+    totals = table.sum(axis=1).sort_values(ascending=False)
+    return table.loc[totals.index[:top_n]]
+
+
+def plot_binned_distribution(counts: pd.Series,
+                             bins_per_decade: Optional[int] = None,
+                             kde: bool = True, top_n: int = 9, ncols: int = 3,
+                             xlabel: Optional[str] = None,
+                             title: Optional[str] = None) -> plt.Figure:
+    """
+    Plot a log-scale histogram from precomputed log bin counts
+    
+    Parameters
+    ----------
+    counts : pd.Series
+        Output of log_bin_counts, merge_bin_counts or stream_log_bin_counts;
+        grouped counts are drawn as small multiples
+    bins_per_decade : int, optional
+        Number of bins per power of ten used to build the counts; defaults to
+        counts.attrs['bins_per_decade'] and must agree with it when both are set
+    kde : bool, default=True
+        Whether to overlay a KDE computed from the binned data
+    top_n : int, default=9
+        Number of largest groups to display for grouped counts
+    ncols : int, default=3
+        Number of panel columns for grouped counts
+    xlabel : str, optional
+        X-axis label
+    title : str, optional
+        Plot title
+        
+    Returns
+    -------
+    plt.Figure
+        The figure containing the plot
+    """
+    if counts.empty:
+        raise ValueError("No positive values to plot on a log scale")
+    
+    recorded = counts.attrs.get('bins_per_decade')
+    if bins_per_decade is None:
+        bins_per_decade = recorded
+    elif recorded is not None and recorded != bins_per_decade:
+        raise ValueError(f"bins_per_decade={bins_per_decade} does not match "
+                         f"the counts, which were built with {recorded}")
+    
+    # attrs is dropped by many pandas operations, so allow passing it explicitly
+    if bins_per_decade is None:
+        raise ValueError("Counts do not record bins_per_decade; pass it explicitly")
+    
+    if counts.index.nlevels > 1:
+        table = counts.unstack(fill_value=0)
+    else:
+        table = counts.to_frame().T
+    
+    # All panels share one dense range of bins
+    bins = table.columns.astype(np.int64)
+    bin_range = np.arange(bins.min(), bins.max() + 1)
+    table = _top_groups(table.reindex(columns=bin_range, fill_value=0), top_n)
+    edges = 10.0 ** (np.arange(bins.min(), bins.max() + 2) / bins_per_decade)
+    
+    if title is None:
+        title = 'Distribution' if xlabel is None else f'Distribution of {xlabel}'
+    
+    return _plot_binned_panels(edges, table, True, kde, xlabel or '', title, ncols)
+
+
 def plot_pollutant_distribution(df: pd.DataFrame, pollutant_col: str,
                                log_scale: bool = False,
-                               title: Optional[str] = None) -> plt.Figure:
+                               title: Optional[str] = None,
+                               groupby_col: Optional[str] = None,
+                               bins: int = 50,
+                               bins_per_decade: int = 10,
+                               kde: bool = True,
+                               top_n: int = 9,
+                               ncols: int = 3) -> plt.Figure:
     """
     Create a histogram showing the distribution of a pollutant
     
+    Values are binned with NumPy before plotting and the KDE is computed
+    from the bin counts, so rendering time does not depend on row count.
+    
     Parameters
     ----------
     df : pd.DataFrame
@@ -182,40 +449,56 @@ def plot_pollutant_distribution(df: pd.DataFrame, pollutant_col: str,
     pollutant_col : str
         Column name containing pollutant amounts
     log_scale : bool, default=False
-        Whether to use a logarithmic scale for the x-axis
+        Whether to use log-spaced bins and a logarithmic x-axis
+        (zero and negative values are dropped)
     title : str, optional
         Plot title
+    groupby_col : str, optional
+        Column to draw one panel per group for (e.g., 'Substance_Name', 'Province')
+    bins : int, default=50
+        Number of bins on a linear scale
+    bins_per_decade : int, default=10
+        Number of bins per power of ten on a log scale
+    kde : bool, default=True
+        Whether to overlay a KDE computed from the binned data
+    top_n : int, default=9
+        Number of largest groups to display when groupby_col is given
+    ncols : int, default=3
+        Number of panel columns when groupby_col is given
         
     Returns
     -------
     plt.Figure
         The figure containing the plot
     """
-    set_plotting_style()
-    
-    # Create the plot
-    fig, ax = plt.subplots()
-    
-    # Remove zero or negative values if using log scale
-    plot_data = df[pollutant_col]
     if log_scale:
-        plot_data = plot_data[plot_data > 0]
+        counts = log_bin_counts(df, pollutant_col, bins_per_decade, groupby_col)
+        return plot_binned_distribution(counts, bins_per_decade, kde, top_n, ncols,
+                                        xlabel=pollutant_col, title=title)
     
-    # Create histogram
-    sns.histplot(plot_data, kde=True, ax=ax)
+    values = df[pollutant_col].to_numpy(dtype=float, na_value=np.nan)
+    mask = np.isfinite(values)
+    values = values[mask]
+    if not values.size:
+        raise ValueError(f"No values to plot in '{pollutant_col}'")
     
-    # Set logarithmic scale if requested
-    if log_scale:
-        ax.set_xscale('log')
+    # Evenly spaced bins over the full range, with the maximum in the last bin
+    low, high = values.min(), values.max()
+    width = (high - low) / bins if high > low else 1.0
+    bin_idx = np.minimum(((values - low) / width).astype(np.int64), bins - 1)
+    edges = low + width * np.arange(bins + 1)
     
-    # Set plot labels and title
-    ax.set_xlabel(pollutant_col)
-    ax.set_ylabel('Frequency')
-    
-    if title:
-        ax.set_title(title)
+    if groupby_col:
+        groups = df[groupby_col].to_numpy()[mask]
+        table = pd.DataFrame({groupby_col: groups, 'bin': bin_idx}).groupby(
+            [groupby_col, 'bin']).size().unstack(fill_value=0)
+        if table.empty:
+            raise ValueError(f"No values with a '{groupby_col}' group to plot")
+        table = _top_groups(table.reindex(columns=range(bins), fill_value=0), top_n)
     else:
-        ax.set_title(f'Distribution of {pollutant_col}')
+        table = pd.DataFrame([np.bincount(bin_idx, minlength=bins)])
     
-    plt.tight_layout()
-    return fig
+    if title is None:
+        title = f'Distribution of {pollutant_col}'
+    
+    return _plot_binned_panels(edges, table, False, kde, pollutant_col, title, ncols)